@@ -1,6 +1,4 @@
-from datetime import datetime
-
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Float
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String, Float, func
 
 from chequer.auth.models import User
 from chequer.database import Base
@@ -8,6 +6,9 @@ from chequer.database import Base
 
 class Account(Base):
     __tablename__ = "accounts"
+    # Fetch server-generated columns in the INSERT/UPDATE itself so no
+    # refresh SELECT is needed after a flush.
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     uploader_id = Column(Integer, ForeignKey(User.id), nullable=False)
@@ -18,5 +19,8 @@ class Account(Base):
     phone = Column(String, nullable=False, unique=True)
     balance = Column(Float, nullable=False)
     signature_url = Column(String, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), default=datetime.now, onupdate=datetime.now)
+    # float16-packed VGG16 embedding of the reference signature; computed at
+    # account creation so cheque clearance only embeds the cheque crop.
+    signature_embedding = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,18 +1,94 @@
-from fastapi import APIRouter, Depends, File, HTTPException, Security, UploadFile, status, Body
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import numpy as np
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, Security, UploadFile, status, Body
+from PIL import Image
+from sqlalchemy import select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from chequer.accounts.models import Account
 from chequer.accounts.schemas import AccountCreate, AccountResponse, AccountUpdate
+from chequer.accounts.services import get_account_by_account_number
 from chequer.auth.dependencies import get_current_user, is_user_authenticated
 from chequer.auth.models import User
+from chequer.ocr_engine.v1.analyse import get_signature_similarity_engine
+from chequer.ocr_engine.v1.signature_index import get_signature_index
 from chequer.utils.db_utils import get_db
+from chequer.utils.http_cache import is_etag_match, make_etag
 from chequer.utils.s3_utils.s3_store import ChequerStore, StoreTypes
 
 router = APIRouter(
     prefix="/accounts", tags=["accounts"], dependencies=[Security(is_user_authenticated)]
 )
 
+# Compiled once at import time; both updates run in the same transaction so the
+# balance check and the debit happen atomically inside Postgres.
+_DEBIT_STMT = text(
+    "UPDATE accounts SET balance = balance - :amount "
+    "WHERE id = :account_id AND balance >= :amount "
+    "RETURNING account_number, balance"
+)
+_CREDIT_STMT = text(
+    "UPDATE accounts SET balance = balance + :amount "
+    "WHERE id = :account_id "
+    "RETURNING account_number, balance"
+)
+# Lock both rows in id order before touching balances; opposing transfers on
+# the same pair then queue instead of tripping Postgres deadlock detection.
+_LOCK_ACCOUNTS_STMT = text(
+    "SELECT id FROM accounts WHERE id IN (:id_1, :id_2) ORDER BY id FOR UPDATE"
+)
+
+# Image decode/encode is pure CPU; a small process pool keeps it off the
+# event loop and out of the GIL. Workers are forked lazily, after the
+# lifespan has loaded TensorFlow and its thread pools — forking that
+# process can deadlock, so the pool spawns fresh interpreters instead.
+_image_pool = ProcessPoolExecutor(
+    max_workers=2, mp_context=multiprocessing.get_context("spawn")
+)
+
+
+def _resize_and_encode(raw: bytes, max_side: int = 1024) -> bytes:
+    """Downscale a signature image and re-encode it as JPEG.
+
+    Parameters
+    ----------
+    - **raw**: (bytes) Original image bytes
+    - **max_side**: (int) Maximum width/height of the stored image
+
+    Returns
+    -------
+    - **bytes**: JPEG-encoded image
+    """
+    image = Image.open(BytesIO(raw))
+    image.thumbnail((max_side, max_side))
+    buffer = BytesIO()
+    image.convert("RGB").save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def _embed_signature_bytes(image_bytes: bytes) -> bytes:
+    """Embed a signature image and pack it for the signature_embedding column.
+
+    Parameters
+    ----------
+    - **image_bytes**: (bytes) Encoded signature image
 
-@router.post("/create")
+    Returns
+    -------
+    - **bytes**: float16-packed VGG16 embedding
+    """
+    engine = get_signature_similarity_engine()
+    embedding = engine.embed_signature(Image.open(BytesIO(image_bytes)))
+    return embedding.astype(np.float16).tobytes()
+
+
+# response_model keeps the binary signature_embedding column out of the
+# serialized response; jsonable_encoder cannot decode the packed bytes.
+@router.post("/create", response_model=AccountResponse)
 async def create_account(
     account: AccountCreate = Depends(),
     image_file: UploadFile = File(...),
@@ -39,31 +115,70 @@ async def create_account(
     - **AccountResponse**: Account creation details
     """
     store = ChequerStore(StoreTypes.SIGNATURES)
-    image = await image_file.read()
-
-    uri = store.upload_file(image, f"{account.account_number}.png")
-
-    new_account = Account(
-        uploader_id=current_user.id,
-        account_number=account.account_number,
-        ifs_code=account.ifs_code,
-        name=account.name,
-        email=account.email,
-        phone=account.phone,
-        balance=account.balance,
-        signature_url=uri,
+    file_name = f"{account.account_number}.jpg"
+
+    # Pull the upload in 256 KB chunks rather than one whole-file read.
+    raw_image = bytearray()
+    while chunk := await image_file.read(1 << 18):
+        raw_image.extend(chunk)
+    raw_image = bytes(raw_image)
+    signature_image = await asyncio.get_running_loop().run_in_executor(
+        _image_pool, _resize_and_encode, raw_image
+    )
+    signature_embedding = await asyncio.to_thread(_embed_signature_bytes, signature_image)
+
+    insert_stmt = (
+        pg_insert(Account)
+        .values(
+            uploader_id=current_user.id,
+            account_number=account.account_number,
+            ifs_code=account.ifs_code,
+            name=account.name,
+            email=account.email,
+            phone=account.phone,
+            balance=account.balance,
+            signature_url=store.get_file_uri(file_name),
+            signature_embedding=signature_embedding,
+        )
+        .on_conflict_do_nothing(index_elements=["account_number"])
+        .returning(Account)
+    )
+
+    def _upload_signature():
+        try:
+            store.upload_fileobj(BytesIO(signature_image), file_name)
+        except FileExistsError:
+            # Re-running a create for the same account number reuses the
+            # signature that is already in the store.
+            pass
+
+    def _insert_account():
+        created = db.execute(insert_stmt).scalar_one_or_none()
+        db.commit()
+        return created
+
+    # The URI is deterministic, so the upload and the INSERT can overlap;
+    # latency becomes max(S3, Postgres) instead of their sum.
+    _, new_account = await asyncio.gather(
+        asyncio.to_thread(_upload_signature),
+        asyncio.to_thread(_insert_account),
+    )
+    if new_account is None:
+        return get_account_by_account_number(account.account_number, db)
+    get_signature_index().add(
+        new_account.id, np.frombuffer(signature_embedding, np.float16).astype(np.float32)
     )
-    db.add(new_account)
-    db.commit()
-    db.refresh(new_account)
     return new_account
 
 
 @router.get("/get/{account_id}", response_model=AccountResponse)
-async def get_account(account_id: int, db=Depends(get_db)) -> AccountResponse:
+async def get_account(account_id: int, request: Request, response: Response, db=Depends(get_db)):
     """
     Get account details by account ID.
 
+    Returns 304 Not Modified when the client's If-None-Match tag still
+    matches the row's updated_at, skipping hydration and serialization.
+
     Parameters
     ----------
     - **account_id**: (int) Account ID
@@ -73,10 +188,16 @@ async def get_account(account_id: int, db=Depends(get_db)) -> AccountResponse:
     -------
     - **AccountResponse**: Account details
     """
-    account = db.query(Account).filter(Account.id == account_id).first()
-    if account is None:
+    updated_at = db.execute(
+        select(Account.updated_at).where(Account.id == account_id)
+    ).scalar_one_or_none()
+    if updated_at is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
-    return account
+    etag = make_etag(account_id, updated_at)
+    if is_etag_match(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    response.headers["ETag"] = etag
+    return db.get(Account, account_id)
 
 
 @router.put("/update/{account_id}")
@@ -96,13 +217,15 @@ async def update_account(
     -------
     - **AccountResponse**: Account details
     """
-    db_account = db.query(Account).filter(Account.id == account_id).first()
+    db_account = db.execute(
+        update(Account)
+        .where(Account.id == account_id)
+        .values(**account.model_dump(exclude_unset=True))
+        .returning(Account)
+    ).scalar_one_or_none()
     if db_account is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
-    for key, value in account.model_dump().items():
-        setattr(db_account, key, value)
     db.commit()
-    db.refresh(db_account)
     return db_account
 
 
@@ -120,11 +243,10 @@ async def delete_account(account_id: int, db=Depends(get_db)) -> dict:
     -------
     - **dict**: JSON response with the status of account deletion
     """
-    db_account = db.query(Account).filter(Account.id == account_id).first()
+    db_account = db.get(Account, account_id)
     if db_account is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
     db.delete(db_account)
-    db.commit()
     return {"status": "Account deleted"}
 
 
@@ -146,25 +268,32 @@ async def transfer_amount(
     -------
     - **dict**: JSON response with the status of the transfer
     """
-    from_account = db.query(Account).filter(Account.id == from_account_id).first()
-    to_account = db.query(Account).filter(Account.id == to_account_id).first()
-    if from_account is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail=f"Account not found {from_account_id}"
+    locked_ids = {
+        row.id
+        for row in db.execute(
+            _LOCK_ACCOUNTS_STMT, {"id_1": from_account_id, "id_2": to_account_id}
         )
-    if to_account is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail=f"Account not found {to_account_id}"
-        )
-    if from_account.balance < amount:
+    }
+    for account_id in (from_account_id, to_account_id):
+        if account_id not in locked_ids:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=f"Account not found {account_id}"
+            )
+    debited = db.execute(
+        _DEBIT_STMT, {"account_id": from_account_id, "amount": amount}
+    ).first()
+    if debited is None:
+        db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Insufficient balance")
-    from_account.balance -= amount
-    to_account.balance += amount
+    credited = db.execute(
+        _CREDIT_STMT, {"account_id": to_account_id, "amount": amount}
+    ).first()
     db.commit()
     return {
         "status": "Amount transferred successfully",
         "new_balance": {
-            from_account.account_number: from_account.balance,
-            to_account.account_number: to_account.balance,
+            debited.account_number: debited.balance,
+            credited.account_number: credited.balance,
         },
     }
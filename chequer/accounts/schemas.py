@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from datetime import datetime
 from fastapi import UploadFile
 
@@ -38,6 +38,8 @@ class AccountUpdatePhone(BaseModel):
 
 
 class AccountResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     uploader_id: int
     account_number: str
@@ -49,19 +51,3 @@ class AccountResponse(BaseModel):
     balance: float
     created_at: datetime
     updated_at: datetime
-
-    @classmethod
-    def from_orm(cls, account):
-        return cls(
-            id=account.id,
-            uploader_id=account.uploader_id,
-            account_number=account.account_number,
-            ifs_code=account.ifs_code,
-            name=account.name,
-            email=account.email,
-            phone=account.phone,
-            signature_url=account.signature_url,
-            balance=account.balance,
-            created_at=account.created_at,
-            updated_at=account.updated_at,
-        )
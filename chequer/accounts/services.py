@@ -1,6 +1,11 @@
+from sqlalchemy import bindparam, select
+
 from chequer.utils.db_utils import DBSession
 from chequer.accounts.models import Account
 
+# Built once at import time so repeated lookups reuse the compiled statement.
+_ACCOUNT_BY_NUMBER_STMT = select(Account).filter_by(account_number=bindparam("account_number"))
+
 
 def get_account_by_id(account_id: int, db=None) -> Account:
     """Get account details by account ID.
@@ -18,7 +23,7 @@ def get_account_by_id(account_id: int, db=None) -> Account:
         _db = db
     else:
         _db = DBSession().db
-    return _db.query(Account).filter(Account.id == account_id).first()
+    return _db.get(Account, account_id)
 
 
 def get_account_by_account_number(account_number: str, db=None) -> Account:
@@ -37,4 +42,30 @@ def get_account_by_account_number(account_number: str, db=None) -> Account:
         _db = db
     else:
         _db = DBSession().db
-    return _db.query(Account).filter(Account.account_number == account_number).first()
+    return _db.execute(
+        _ACCOUNT_BY_NUMBER_STMT, {"account_number": account_number}
+    ).scalar_one_or_none()
+
+
+def get_accounts_by_account_numbers(account_numbers, db=None) -> dict:
+    """Get accounts for several account numbers in one query.
+
+    Parameters
+    ----------
+    - **account_numbers**: (list[str]) Account numbers
+    - **db**: (Session) Database session
+
+    Returns
+    -------
+    - **dict**: Mapping of account number to Account
+    """
+    if db is not None:
+        _db = db
+    else:
+        _db = DBSession().db
+    rows = (
+        _db.execute(select(Account).where(Account.account_number.in_(account_numbers)))
+        .scalars()
+        .all()
+    )
+    return {account.account_number: account for account in rows}
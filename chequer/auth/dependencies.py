@@ -1,6 +1,9 @@
 import os
+import time
+from functools import lru_cache
 
 import jwt
+from cachetools import TTLCache
 from fastapi import Cookie, Depends, status
 from fastapi.exceptions import HTTPException
 from jwt.exceptions import DecodeError, ExpiredSignatureError
@@ -12,39 +15,95 @@ from chequer.utils.db_utils import get_db
 SECRET_KEY = os.environ["SECRET_KEY"]
 ALGORITHM = os.environ["ALGORITHM"]
 
+# One decoder instance with the algorithm list and options resolved at import
+# time, so per-request decodes skip re-validating the decode parameters.
+_jwt_decoder = jwt.PyJWT()
+_jwt_algorithms = (ALGORITHM,)
+_jwt_options = {"require": ["exp"]}
+
+# Users resolved from valid tokens, keyed on (username, exp) so entries can
+# never outlive the token that produced them. Saves one SELECT per request.
+_user_cache = TTLCache(maxsize=10_000, ttl=60)
 
-def get_current_user(access_token: str = Cookie(None), db=Depends(get_db)) -> Optional[User]:
-    """Get the current user from the access token.
+
+@lru_cache(maxsize=100_000)
+def _decode_token_payload(access_token: str) -> dict:
+    """Decode and verify a token's signature, memoized on the token string.
+
+    Clients resend the same cookie for the life of the token, so the HMAC
+    verification only has to run once per token per process. Expiry must be
+    re-checked by the caller because cached payloads outlive their exp.
 
     Parameters
     ----------
     - **access_token**: (str) Access token
-    - **db**: (Session) Database session
 
     Returns
     -------
-    - **User**: User details
+    - **dict**: Decoded token payload
+    """
+    return _jwt_decoder.decode(
+        access_token, SECRET_KEY, algorithms=_jwt_algorithms, options=_jwt_options
+    )
+
+
+def _decode_access_token(access_token: str) -> dict:
+    """Decode and validate the access token.
+
+    Parameters
+    ----------
+    - **access_token**: (str) Access token
+
+    Returns
+    -------
+    - **dict**: Decoded token payload
     """
-    if access_token is None:
-        return None
     try:
-        payload = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("username")
-        if username is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-            )
+        payload = _decode_token_payload(access_token)
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
         )
-    except DecodeError:
+    except (DecodeError, jwt.exceptions.MissingRequiredClaimError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
+    if payload["exp"] <= time.time():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired",
+        )
+    if payload.get("username") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    return payload
+
+
+def get_current_user(access_token: str = Cookie(None), db=Depends(get_db)) -> Optional[User]:
+    """Get the current user from the access token.
+
+    Parameters
+    ----------
+    - **access_token**: (str) Access token
+    - **db**: (Session) Database session
+
+    Returns
+    -------
+    - **User**: User details
+    """
+    if access_token is None:
+        return None
+    payload = _decode_access_token(access_token)
+    username = payload["username"]
+
+    cache_key = (username, payload.get("exp"))
+    user = _user_cache.get(cache_key)
+    if user is not None:
+        return user
 
     user = db.query(User).filter(User.username == username).first()
     if user is None:
@@ -52,18 +111,25 @@ def get_current_user(access_token: str = Cookie(None), db=Depends(get_db)) -> Op
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+    _user_cache[cache_key] = user
     return user
 
 
-def is_user_authenticated(current_user: User = Depends(get_current_user)) -> bool:
+def is_user_authenticated(access_token: str = Cookie(None)) -> bool:
     """Check if the user is authenticated.
 
+    Validates the access token without touching the database; routes that
+    need the actual user record should depend on `get_current_user`.
+
     Parameters
     ----------
-    - **current_user**: (User) Current user
+    - **access_token**: (str) Access token
 
     Returns
     -------
     - **bool**: True if the user is authenticated, False otherwise
     """
-    return current_user is not None
+    if access_token is None:
+        return False
+    _decode_access_token(access_token)
+    return True
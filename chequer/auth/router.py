@@ -1,18 +1,21 @@
 # Standard Imports
+import asyncio
 import os
 from datetime import datetime, timedelta
 
 # Third Party Imports
 import bcrypt
 import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
 from dotenv import load_dotenv
 
 # Fastapi imports
 from fastapi import APIRouter, Depends, status
 from fastapi.exceptions import HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
+from sqlalchemy import update
 
 # Ayush-Connect imports
 from chequer.auth.dependencies import get_current_user, get_db
@@ -27,10 +30,32 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Tuned so a single verify costs ~50 ms; hashing runs in a worker thread.
+password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
+def verify_password(password: str, stored_hash: str) -> bool:
+    """Verify a password against a stored hash.
+
+    Parameters
+    ----------
+    - **password**: (str) Plain-text password
+    - **stored_hash**: (str) Hash stored for the user
+
+    Returns
+    -------
+    - **bool**: True if the password matches, False otherwise
+    """
+    try:
+        return password_hasher.verify(stored_hash, password)
+    except VerifyMismatchError:
+        return False
+    except InvalidHashError:
+        # Hashes created before the argon2id switch are bcrypt.
+        return bcrypt.checkpw(password.encode("utf-8"), stored_hash.encode("utf-8"))
+
+
 def create_jwt_token(data: dict, expires_delta: timedelta = timedelta(hours=3)):
     to_encode = data.copy()
     if expires_delta:
@@ -43,7 +68,7 @@ def create_jwt_token(data: dict, expires_delta: timedelta = timedelta(hours=3)):
 
 
 @router.post("/signup")
-async def signup(user: UserCreate, db=Depends(get_db)) -> JSONResponse:
+async def signup(user: UserCreate, db=Depends(get_db)) -> ORJSONResponse:
     """
     Create a new user in the database.
 
@@ -59,7 +84,7 @@ async def signup(user: UserCreate, db=Depends(get_db)) -> JSONResponse:
 
     Returns
     -------
-    - **JSONResponse**: JSON response with the status of user creation
+    - **ORJSONResponse**: JSON response with the status of user creation
 
     Raises
     ------
@@ -67,7 +92,7 @@ async def signup(user: UserCreate, db=Depends(get_db)) -> JSONResponse:
                     - **500** - If user creation fails
     """
     try:
-        hashed_password = password_context.hash(user.password)
+        hashed_password = await asyncio.to_thread(password_hasher.hash, user.password)
         db_user = User(
             username=user.username,
             name=user.name,
@@ -77,7 +102,6 @@ async def signup(user: UserCreate, db=Depends(get_db)) -> JSONResponse:
 
         db.add(db_user)
         db.commit()
-        db.refresh(db_user)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed insering into db. Error:{e}")
 
@@ -86,7 +110,7 @@ async def signup(user: UserCreate, db=Depends(get_db)) -> JSONResponse:
         {"username": db_user.username}, expires_delta=access_token_expires
     )
 
-    response = JSONResponse(
+    response = ORJSONResponse(
         status_code=201,
         content={
             "message": f"User - '{db_user.username}' created successfully.",
@@ -100,7 +124,7 @@ async def signup(user: UserCreate, db=Depends(get_db)) -> JSONResponse:
 
 
 @router.post("/login")
-async def login(user_login: UserLogin, db=Depends(get_db)) -> JSONResponse:
+async def login(user_login: UserLogin, db=Depends(get_db)) -> ORJSONResponse:
     """
     Log in a user by verifying their credentials and providing an access token.
 
@@ -113,7 +137,7 @@ async def login(user_login: UserLogin, db=Depends(get_db)) -> JSONResponse:
 
     Returns
     -------
-    - **JSONResponse**: JSON response with the status of user login and an access token
+    - **ORJSONResponse**: JSON response with the status of user login and an access token
 
     Raises
     ------
@@ -125,7 +149,7 @@ async def login(user_login: UserLogin, db=Depends(get_db)) -> JSONResponse:
 
     user = db.query(User).filter(User.username == username).first()
 
-    if user is None or not bcrypt.checkpw(password.encode("utf-8"), user.password.encode("utf-8")):
+    if user is None or not await asyncio.to_thread(verify_password, password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -134,7 +158,7 @@ async def login(user_login: UserLogin, db=Depends(get_db)) -> JSONResponse:
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_jwt_token({"username": user.username}, expires_delta=access_token_expires)
 
-    response = JSONResponse(
+    response = ORJSONResponse(
         status_code=201,
         content={
             "message": f"User - '{user.username}' logged in successfully.",
@@ -158,7 +182,7 @@ async def logout(user: UserResponse = Depends(get_current_user)):
 
     Returns
     -------
-    - **JSONResponse**: JSON response with the status of user logout
+    - **ORJSONResponse**: JSON response with the status of user logout
 
     Raises
     ------
@@ -167,7 +191,7 @@ async def logout(user: UserResponse = Depends(get_current_user)):
     """
 
     if user:
-        response = JSONResponse(content={"message": "Logged out successfully"})
+        response = ORJSONResponse(content={"message": "Logged out successfully"})
         response.delete_cookie("access_token")
         return response
 
@@ -204,7 +228,7 @@ async def get_user(username: str, db=Depends(get_db)):
 
 
 @router.put("/{username}")
-async def update_user(username: str, user: UserUpdate, db=Depends(get_db)) -> JSONResponse:
+async def update_user(username: str, user: UserUpdate, db=Depends(get_db)) -> ORJSONResponse:
     """
     Update user information by user ID.
 
@@ -216,7 +240,7 @@ async def update_user(username: str, user: UserUpdate, db=Depends(get_db)) -> JS
 
     Returns
     -------
-    - **JSONResponse**: JSON response with the status of user update
+    - **ORJSONResponse**: JSON response with the status of user update
 
     Raises
     ------
@@ -225,23 +249,26 @@ async def update_user(username: str, user: UserUpdate, db=Depends(get_db)) -> JS
                     - **500** - If there is an error while updating user information
     """
     try:
-        db_user = db.query(User).filter(User.username == username).first()
-        if db_user is None:
-            raise HTTPException(status_code=404, detail="User not found")
-        for key, value in user.dict().items():
-            setattr(db_user, key, value)
-        db.commit()
-        db.refresh(db_user)
+        db_user = db.execute(
+            update(User)
+            .where(User.username == username)
+            .values(**user.model_dump(exclude_unset=True))
+            .returning(User)
+        ).scalar_one_or_none()
+        if db_user is not None:
+            db.commit()
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to update user details.")
-    return JSONResponse(
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return ORJSONResponse(
         status_code=201,
         content={"message": f"User - '{db_user.username}' updated successfully."},
     )
 
 
 @router.delete("/{username}")
-async def delete_user(username: str, db=Depends(get_db)) -> JSONResponse:
+async def delete_user(username: str, db=Depends(get_db)) -> ORJSONResponse:
     """
     Delete a user by user ID.
 
@@ -252,7 +279,7 @@ async def delete_user(username: str, db=Depends(get_db)) -> JSONResponse:
 
     Returns
     -------
-    - **JSONResponse**: JSON response with the status of user deletion
+    - **ORJSONResponse**: JSON response with the status of user deletion
 
     Raises
     ------
@@ -265,10 +292,9 @@ async def delete_user(username: str, db=Depends(get_db)) -> JSONResponse:
         if db_user is None:
             raise HTTPException(status_code=404, detail="User not found")
         db.delete(db_user)
-        db.commit()
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to delete user details.")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=201,
         content={"message": f"User - '{db_user.username}' deleted successfully."},
     )
@@ -16,7 +16,18 @@ db_port = os.environ["DB_PORT"]
 # postgresql pspcopg url
 db_url = f"postgresql+psycopg://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
 
-sync_engine = create_engine(db_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+sync_engine = create_engine(
+    db_url,
+    pool_size=int(os.getenv("SQLALCHEMY_POOL_SIZE", "30")),
+    max_overflow=int(os.getenv("SQLALCHEMY_MAX_OVERFLOW", "20")),
+    pool_recycle=int(os.getenv("SQLALCHEMY_POOL_RECYCLE", "3600")),
+    pool_pre_ping=True,
+)
+# expire_on_commit=False keeps instances readable after commit; without it
+# every post-commit attribute access triggers a refresh SELECT, defeating
+# the eager_defaults/RETURNING work on the models.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=sync_engine
+)
 
 Base = declarative_base()
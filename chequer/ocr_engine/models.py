@@ -1,37 +1,45 @@
-from sqlalchemy import Column, DateTime, Integer, String, ForeignKey, Float
-from datetime import datetime
-
+from sqlalchemy import Column, DateTime, Integer, String, ForeignKey, Float, func
 from chequer.database import Base
 from chequer.accounts.models import Account
 
 
 class ChequeClearedRecord(Base):
     __tablename__ = "cheque_cleared_records"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    payer_id = Column(Integer, ForeignKey(Account.id), nullable=False)
+    # Textract can miss any extracted field and the payer may be unknown;
+    # rejected cheques are still recorded, so those columns stay nullable.
+    payer_id = Column(Integer, ForeignKey(Account.id), nullable=True)
     image_uri = Column(String, nullable=False)
     ocr_uri = Column(String, nullable=False)
     to_account_number = Column(String, nullable=False)
-    payee_name = Column(String, nullable=False)
-    amount = Column(Float, nullable=False)
-    ifs_code = Column(String, nullable=False)
-    cheque_date = Column(DateTime(timezone=True), nullable=False)
-    cheque_number = Column(String, nullable=False)
+    payee_name = Column(String, nullable=True)
+    amount = Column(Float, nullable=True)
+    ifs_code = Column(String, nullable=True)
+    cheque_date = Column(DateTime(timezone=True), nullable=True)
+    cheque_number = Column(String, nullable=True)
     status = Column(String, nullable=False)
     signature_similarity = Column(Float, nullable=False)
+    # SHA-1 of the cheque image; keys the Textract response cache.
+    content_hash = Column(String, nullable=True)
+    # JSON list of (account_id, similarity) near-duplicate signature matches.
+    similar_signatures = Column(String, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), default=datetime.now, onupdate=datetime.now)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
 class ChequerTextractQueue(Base):
     __tablename__ = "chequer_textract_queue"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     image_uri = Column(String, nullable=False)
     to_account_number = Column(String, nullable=False)
     status = Column(String, nullable=False)
     response = Column(String, default="")
-    created_at = Column(DateTime(timezone=True), default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), default=datetime.now, onupdate=datetime.now)
+    # Textract StartDocumentAnalysis job; set for rows processed async.
+    job_id = Column(String, nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
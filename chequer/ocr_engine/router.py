@@ -1,24 +1,102 @@
 from fastapi.routing import APIRouter
-from fastapi import Depends, HTTPException, status, Security, UploadFile
+from fastapi import Depends, HTTPException, Request, Response, status, Security, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from chequer.auth.dependencies import get_current_user, is_user_authenticated
+from chequer.database import SessionLocal
 from chequer.utils.db_utils import get_db
+from chequer.utils.http_cache import is_etag_match, make_etag
 from chequer.utils.s3_utils.s3_store import ChequerStore, StoreTypes
-from chequer.accounts.services import get_account_by_id, get_account_by_account_number
+from chequer.accounts.services import get_account_by_id, get_accounts_by_account_numbers
 from chequer.ocr_engine.models import ChequerTextractQueue, ChequeClearedRecord
-from chequer.ocr_engine.v1.analyse import TextractEngine, SignatureSimilarityEngine
+from chequer.ocr_engine.schemas import ClearChequesRequest
+from chequer.ocr_engine.v1.analyse import get_signature_similarity_engine, get_textract_engine
+from chequer.ocr_engine.v1.signature_index import get_signature_index
 from uuid import uuid4
+from io import BytesIO
+import hashlib
+import numpy as np
 from PIL import Image
-import json
+import asyncio
+import orjson
+import os
 
 router = APIRouter(
     prefix="/ocr-engine/v1", tags=["ocr-engine"], dependencies=[Security(is_user_authenticated)]
 )
 
-SSE = SignatureSimilarityEngine()
+# Caps in-flight Textract calls so bursts do not trip the service TPS quota.
+_textract_semaphore = asyncio.Semaphore(int(os.getenv("TEXTRACT_MAX_CONCURRENCY", "5")))
+
+
+def _exceeds_balance(amount, balance) -> bool:
+    """Whether the extracted cheque amount exceeds the payer's balance.
+
+    Parameters
+    ----------
+    - **amount**: (str | None) Amount as extracted by Textract
+    - **balance**: (float) Payer account balance
+
+    Returns
+    -------
+    - **bool**: True if the amount parses and exceeds the balance
+    """
+    if amount is None:
+        return False
+    try:
+        return float(amount) > balance
+    except ValueError:
+        return False
+
+
+def _decide_status(from_account, to_account, payee_name, amount) -> str:
+    """Decide the cheque status from the extracted fields.
+
+    Parameters
+    ----------
+    - **from_account**: (Account | None) Payer account
+    - **to_account**: (Account | None) Payee account
+    - **payee_name**: (str | None) Payee name as extracted by Textract
+    - **amount**: (str | None) Amount as extracted by Textract
+
+    Returns
+    -------
+    - **str**: Cheque status; the first failed check decides it
+    """
+    if from_account is None:
+        return "FROM_ACCOUNT_NOT_FOUND"
+    if to_account is None:
+        return "TO_ACCOUNT_NOT_FOUND"
+    if to_account.name != payee_name:
+        return "PAYEE_NAME_MISMATCH"
+    if _exceeds_balance(amount, from_account.balance):
+        return "BOUNCE"
+    return "CLEARED"
+
+
+def _upload_ocr_dict(ocr_store: ChequerStore, ocr_dict: dict, ocr_file_name: str) -> str:
+    """Upload the OCR dump, reusing the object if the cheque was seen before.
+
+    Parameters
+    ----------
+    - **ocr_store**: (ChequerStore) OCR store
+    - **ocr_dict**: (dict) Extracted queries and signature geometry
+    - **ocr_file_name**: (str) Content-hash-derived object name
+
+    Returns
+    -------
+    - **str**: S3 URI of the OCR dump
+    """
+    try:
+        return ocr_store.upload_fileobj(BytesIO(orjson.dumps(ocr_dict)), ocr_file_name)
+    except FileExistsError:
+        # The name is derived from the image content hash, so an existing
+        # object already holds this exact payload.
+        return ocr_store.get_file_uri(ocr_file_name)
 
 
 @router.post("/clear_cheque", status_code=status.HTTP_200_OK)
-def extract_data(image: UploadFile, to_account_number: str, db=Depends(get_db)):
+async def extract_data(image: UploadFile, to_account_number: str, db=Depends(get_db)):
     """
     Extract data from the cheque image.
 
@@ -32,7 +110,8 @@ def extract_data(image: UploadFile, to_account_number: str, db=Depends(get_db)):
     -------
     - **ChequerTextractQueue**: Textract queue item
     """
-    textract_engine = TextractEngine()
+    textract_engine = get_textract_engine()
+    sse = get_signature_similarity_engine()
     ocr_store = ChequerStore(StoreTypes.OCR)
     cheque_store = ChequerStore(StoreTypes.CHEQUES)
     sign_store = ChequerStore(StoreTypes.SIGNATURES)
@@ -40,86 +119,278 @@ def extract_data(image: UploadFile, to_account_number: str, db=Depends(get_db)):
     assert image.content_type is not None
     image_type = image.content_type.split("/")[1]
 
-    image_uri = cheque_store.upload_file(
-        image.file,
-        f"{uuid4()}.{image_type}",
+    # Buffer the body once: the S3 upload streams from its own BytesIO while
+    # the local PIL decode reads another, so neither fights over the upload
+    # file pointer.
+    body = await image.read()
+    content_hash = hashlib.sha1(body).hexdigest()
+    upload_task = asyncio.create_task(
+        asyncio.to_thread(cheque_store.upload_fileobj, BytesIO(body), f"{uuid4()}.{image_type}")
     )
+    cheque_image = Image.open(BytesIO(body))
+    image_uri = await upload_task
+
+    async with _textract_semaphore:
+        document = await asyncio.to_thread(
+            textract_engine.analyze_document_cached, image_uri, content_hash
+        )
+    results = textract_engine.get_query_results(document)
+    from_account_number = results.get("account_number")
+
+    # One IN query covers the payer and payee rows together.
+    accounts = await asyncio.to_thread(
+        get_accounts_by_account_numbers,
+        [number for number in (from_account_number, to_account_number) if number is not None],
+        db,
+    )
+    from_account = accounts.get(from_account_number)
+    to_account = accounts.get(to_account_number)
+
+    payee_name = results.get("payee_name")
+    amount = results.get("amount")
+    cheque_status = _decide_status(from_account, to_account, payee_name, amount)
+
+    ocr_dict = {
+        "Queries": [{"Query": q.alias, "Answer": q.result} for q in document.queries],
+        "Signature": document.signatures[0]._raw_object,
+    }
+    ocr_file_name = f"{content_hash}.json"
+
+    cheque_image_sign = sse.crop_image(
+        cheque_image, ocr_dict["Signature"]["Geometry"]["BoundingBox"]
+    )
+
+    # The cheque crop is embedded exactly once; the same vector drives both
+    # the payer similarity check and the duplicate-signature index lookup.
+    if from_account is None:
+        crop_embedding = None
+        similarity = 0.0
+        ocr_uri = await asyncio.to_thread(_upload_ocr_dict, ocr_store, ocr_dict, ocr_file_name)
+    elif from_account.signature_embedding is not None:
+        # The reference embedding is computed once at account creation, so
+        # only the cheque crop pays the VGG16 pass here.
+        ocr_uri = await asyncio.to_thread(_upload_ocr_dict, ocr_store, ocr_dict, ocr_file_name)
+        reference = np.frombuffer(from_account.signature_embedding, np.float16).astype(np.float32)
+        crop_embedding = await asyncio.to_thread(sse.embed_signature, cheque_image_sign)
+        similarity = sse.similarity_between_embeddings(reference, crop_embedding)
+    elif (reference := sse.get_cached_embedding(from_account.signature_url)) is not None:
+        # A cache hit on the reference skips both the S3 GET and its VGG16
+        # pass.
+        ocr_uri = await asyncio.to_thread(_upload_ocr_dict, ocr_store, ocr_dict, ocr_file_name)
+        crop_embedding = await asyncio.to_thread(sse.embed_signature, cheque_image_sign)
+        similarity = sse.similarity_between_embeddings(reference, crop_embedding)
+    else:
+        # Accounts created before embeddings were stored still fetch and
+        # embed the reference signature; the OCR dump upload and the S3 GET
+        # are independent round-trips, so run them together.
+        ocr_uri, original_signature_image = await asyncio.gather(
+            asyncio.to_thread(_upload_ocr_dict, ocr_store, ocr_dict, ocr_file_name),
+            asyncio.to_thread(sign_store.get_file_from_uri, from_account.signature_url),
+        )
+        original_signature_image = Image.open(BytesIO(original_signature_image))
+        crop_embedding, reference = await asyncio.to_thread(
+            sse.embed_signatures, cheque_image_sign, original_signature_image
+        )
+        sse.store_embedding(from_account.signature_url, reference)
+        similarity = sse.similarity_between_embeddings(reference, crop_embedding)
+
+    similar_signatures = None
+    if crop_embedding is not None:
+        matches = get_signature_index().search(crop_embedding, k=5)
+        matches = [match for match in matches if match[0] != from_account.id]
+        if matches:
+            similar_signatures = orjson.dumps(matches).decode()
 
-    document = textract_engine.analyze_document(image_uri)
-    from_account_number = textract_engine.get_account_number(document)
     cheque_record = ChequeClearedRecord(
+        payer_id=from_account.id if from_account is not None else None,
         image_uri=image_uri,
+        ocr_uri=ocr_uri,
         to_account_number=to_account_number,
-        response=json.dumps(document.response),
+        payee_name=payee_name,
+        # Textract hands back strings; the Float/DateTime columns need real
+        # Python values, and unparseable fields become NULL.
+        amount=textract_engine.parse_amount(amount),
+        ifs_code=results.get("ifs_code"),
+        cheque_date=textract_engine.parse_cheque_date(textract_engine.get_date(document)),
+        cheque_number=results.get("cheque_number"),
+        status=cheque_status,
+        signature_similarity=similarity,
+        content_hash=content_hash,
+        similar_signatures=similar_signatures,
     )
+    db.add(cheque_record)
+    db.commit()
 
-    if from_account_number is None:
-        setattr(cheque_record, "status", "FROM_ACCOUNT_NOT_FOUND")
-    else:
-        from_account = get_account_by_account_number(from_account_number, db)
-        if from_account is None:
-            setattr(cheque_record, "status", "FROM_ACCOUNT_NOT_FOUND")
-        else:
-            setattr(cheque_record, "payer_id", from_account.id)
-
-    to_account = get_account_by_account_number(to_account_number, db)
-    if to_account is None:
-        setattr(cheque_record, "status", "TO_ACCOUNT_NOT_FOUND")
-    if to_account.name is not textract_engine.get_payee_name(document):
-        setattr(cheque_record, "status", "PAYEE_NAME_MISMATCH")
+    if cheque_status == "CLEARED":
+        return cheque_record
+    raise HTTPException(status_code=400, detail="Cheque not cleared.")
 
-    payee_name = textract_engine.get_payee_name(document)
-    amount = textract_engine.get_amount(document)
-    date = textract_engine.get_date(document)
-    bank_name = textract_engine.get_bank_name(document)
-    ifs_code = textract_engine.get_ifs_code(document)
-    cheque_number = textract_engine.get_cheque_number(document)
 
-    setattr(cheque_record, "payee_name", payee_name)
-    setattr(cheque_record, "amount", amount)
+@router.post("/clear_cheques", status_code=status.HTTP_200_OK)
+async def extract_data_batch(batch: ClearChequesRequest, db=Depends(get_db)):
+    """
+    Clear a batch of already-uploaded cheques in one call.
 
-    if amount > from_account.balance.value:
-        setattr(cheque_record, "status", "BOUNCE")
+    Textract calls run concurrently under the shared semaphore and every
+    signature crop in the batch goes through VGG16 in a single forward
+    pass, so the per-cheque fixed cost is paid once per batch.
 
-    setattr(cheque_record, "cheque_date", date)
-    setattr(cheque_record, "bank_name", bank_name)
-    setattr(cheque_record, "ifs_code", ifs_code)
-    setattr(cheque_record, "cheque_number", cheque_number)
+    Parameters
+    ----------
+    - **batch**: (ClearChequesRequest) Cheque image URIs and payee accounts
+    - **db**: (Session) Database session
 
-    if cheque_record.status is None:
-        setattr(cheque_record, "status", "CLEARED")
+    Returns
+    -------
+    - **List[ChequeClearedRecord]**: One record per cheque, status included
+    """
+    textract_engine = get_textract_engine()
+    sse = get_signature_similarity_engine()
+    ocr_store = ChequerStore(StoreTypes.OCR)
+    cheque_store = ChequerStore(StoreTypes.CHEQUES)
+    sign_store = ChequerStore(StoreTypes.SIGNATURES)
 
-    ocr_dict = {
-        "Queries": [{"Query": q.alias, "Answer": q.result} for q in document.queries],
-        "Signature": document.signatures[0]._raw_object,
-    }
+    async def _fetch_and_analyze(item):
+        async with _textract_semaphore:
+            body = await asyncio.to_thread(cheque_store.get_file_from_uri, item.image_uri)
+            content_hash = hashlib.sha1(body).hexdigest()
+            document = await asyncio.to_thread(
+                textract_engine.analyze_document_cached, item.image_uri, content_hash
+            )
+        return body, content_hash, document
 
-    ocr_uri = ocr_store.upload_file(json.dumps(ocr_dict), f"{cheque_record.id}.json")
-    setattr(cheque_record, "ocr_uri", ocr_uri)
+    analyzed = await asyncio.gather(*(_fetch_and_analyze(item) for item in batch.requests))
+    all_results = [textract_engine.get_query_results(document) for _, _, document in analyzed]
 
-    original_signature_image = sign_store.get_file_from_uri(from_account.signature_url.value)
-    original_signature_image = Image.open(original_signature_image)
-    cheque_image = Image.open(image.file)
-    cheque_image_sign = SSE.crop_image(
-        cheque_image, ocr_dict["Signature"]["Geometry"]["BoundingBox"]
+    # One IN query resolves every payer and payee row in the batch.
+    account_numbers = {item.to_account_number for item in batch.requests}
+    account_numbers.update(results.get("account_number") for results in all_results)
+    account_numbers.discard(None)
+    accounts = await asyncio.to_thread(
+        get_accounts_by_account_numbers, list(account_numbers), db
     )
 
-    similarity = SSE.check_signature_similarity(original_signature_image, cheque_image_sign)
+    # First pass: decide statuses, collect the images that need embedding.
+    # Crops and legacy reference signatures share one VGG16 batch.
+    ocr_uploads = []
+    embed_images = []
+    crop_slots = [None] * len(batch.requests)
+    reference_slots = [None] * len(batch.requests)
+    cached_references = {}
+    per_cheque = []
+    for item, (body, content_hash, document), results in zip(
+        batch.requests, analyzed, all_results
+    ):
+        from_account = accounts.get(results.get("account_number"))
+        to_account = accounts.get(item.to_account_number)
+        cheque_status = _decide_status(
+            from_account, to_account, results.get("payee_name"), results.get("amount")
+        )
+        ocr_dict = {
+            "Queries": [{"Query": q.alias, "Answer": q.result} for q in document.queries],
+            "Signature": document.signatures[0]._raw_object,
+        }
+        ocr_uploads.append(
+            asyncio.to_thread(_upload_ocr_dict, ocr_store, ocr_dict, f"{content_hash}.json")
+        )
+        if from_account is not None:
+            crop = sse.crop_image(
+                Image.open(BytesIO(body)), ocr_dict["Signature"]["Geometry"]["BoundingBox"]
+            )
+            crop_slots[len(per_cheque)] = len(embed_images)
+            embed_images.append(crop)
+            if from_account.signature_embedding is None:
+                cached = sse.get_cached_embedding(from_account.signature_url)
+                if cached is not None:
+                    cached_references[len(per_cheque)] = cached
+                else:
+                    reference_image = await asyncio.to_thread(
+                        sign_store.get_file_from_uri, from_account.signature_url
+                    )
+                    reference_slots[len(per_cheque)] = len(embed_images)
+                    embed_images.append(Image.open(BytesIO(reference_image)))
+        per_cheque.append((from_account, content_hash, document, results, cheque_status))
 
-    setattr(cheque_record, "signature_similarity", similarity)
+    ocr_uris = await asyncio.gather(*ocr_uploads)
+    embeddings = (
+        await asyncio.to_thread(sse.embed_signatures, *embed_images) if embed_images else None
+    )
 
-    db.add(cheque_record)
+    records = []
+    for position, (from_account, content_hash, document, results, cheque_status) in enumerate(
+        per_cheque
+    ):
+        similarity = 0.0
+        similar_signatures = None
+        if crop_slots[position] is not None:
+            crop_embedding = embeddings[crop_slots[position]]
+            if position in cached_references:
+                reference = cached_references[position]
+            elif reference_slots[position] is not None:
+                reference = embeddings[reference_slots[position]]
+                sse.store_embedding(from_account.signature_url, reference)
+            else:
+                reference = np.frombuffer(
+                    from_account.signature_embedding, np.float16
+                ).astype(np.float32)
+            similarity = sse.similarity_between_embeddings(reference, crop_embedding)
+            matches = get_signature_index().search(crop_embedding, k=5)
+            matches = [match for match in matches if match[0] != from_account.id]
+            if matches:
+                similar_signatures = orjson.dumps(matches).decode()
+        records.append(
+            ChequeClearedRecord(
+                payer_id=from_account.id if from_account is not None else None,
+                image_uri=batch.requests[position].image_uri,
+                ocr_uri=ocr_uris[position],
+                to_account_number=batch.requests[position].to_account_number,
+                payee_name=results.get("payee_name"),
+                amount=textract_engine.parse_amount(results.get("amount")),
+                ifs_code=results.get("ifs_code"),
+                cheque_date=textract_engine.parse_cheque_date(
+                    textract_engine.get_date(document)
+                ),
+                cheque_number=results.get("cheque_number"),
+                status=cheque_status,
+                signature_similarity=similarity,
+                content_hash=content_hash,
+                similar_signatures=similar_signatures,
+            )
+        )
+    db.add_all(records)
     db.commit()
-    db.refresh(cheque_record)
+    return records
 
-    if cheque_record.status.value == "CLEARED":
-        return cheque_record
-    else:
-        raise HTTPException(status_code=400, detail="Cheque not cleared.")
+
+def _stream_ndjson(model):
+    """Stream rows of a model as NDJSON without materializing the table.
+
+    Rows are fetched 500 at a time via yield_per and serialized with
+    orjson, so peak memory stays flat no matter how large the table is.
+    The generator runs after the request's get_db dependency has already
+    torn down, so it opens (and always closes) its own session.
+
+    Parameters
+    ----------
+    - **model**: (DeclarativeMeta) Mapped model to stream
+
+    Yields
+    ------
+    - **bytes**: One orjson-encoded row per line
+    """
+    columns = [column.name for column in model.__table__.columns]
+    db = SessionLocal()
+    try:
+        rows = db.execute(select(model).execution_options(yield_per=500)).scalars()
+        for row in rows:
+            payload = {name: getattr(row, name) for name in columns}
+            yield orjson.dumps(payload, default=str) + b"\n"
+    finally:
+        db.close()
 
 
 @router.get("/queue", status_code=status.HTTP_200_OK)
-async def get_queue(db=Depends(get_db)):
+async def get_queue(request: Request, db=Depends(get_db)):
     """
     Get the Textract queue.
 
@@ -131,11 +402,21 @@ async def get_queue(db=Depends(get_db)):
     -------
     - **List[ChequerTextractQueue]**: List of Textract queue items
     """
-    return db.query(ChequerTextractQueue).all()
+    latest, total = db.execute(
+        select(func.max(ChequerTextractQueue.updated_at), func.count(ChequerTextractQueue.id))
+    ).one()
+    etag = make_etag("queue", latest, total)
+    if is_etag_match(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    return StreamingResponse(
+        _stream_ndjson(ChequerTextractQueue),
+        media_type="application/x-ndjson",
+        headers={"ETag": etag},
+    )
 
 
 @router.get("/cleared", status_code=status.HTTP_200_OK)
-async def get_cleared(db=Depends(get_db)):
+async def get_cleared(request: Request, db=Depends(get_db)):
     """
     Get the cleared cheques.
 
@@ -147,4 +428,14 @@ async def get_cleared(db=Depends(get_db)):
     -------
     - **List[ChequeClearedRecord]**: List of cleared cheques
     """
-    return db.query(ChequeClearedRecord).all()
+    latest, total = db.execute(
+        select(func.max(ChequeClearedRecord.updated_at), func.count(ChequeClearedRecord.id))
+    ).one()
+    etag = make_etag("cleared", latest, total)
+    if is_etag_match(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    return StreamingResponse(
+        _stream_ndjson(ChequeClearedRecord),
+        media_type="application/x-ndjson",
+        headers={"ETag": etag},
+    )
@@ -1,103 +1,223 @@
-from queue import Queue
+from functools import lru_cache
 from typing import Optional
-from chequer.ocr_engine.v1.analyse import TextractEngine
+from sqlalchemy import text
+from chequer.ocr_engine.v1.analyse import get_textract_engine
 from chequer.ocr_engine.models import ChequerTextractQueue, ChequeClearedRecord
+from chequer.utils.batch_writer import batch_writer
 from chequer.utils.db_utils import DBSession
-from chequer.accounts.models import Account
+from chequer.accounts.services import get_accounts_by_account_numbers
 import json
 import asyncio
 
+# Claims a batch of pending rows; SKIP LOCKED lets several workers drain the
+# same table without stepping on each other's claims or blocking.
+_CLAIM_PENDING_STMT = text(
+    "SELECT id, image_uri, to_account_number FROM chequer_textract_queue "
+    "WHERE status = 'PENDING' ORDER BY id LIMIT :batch_size FOR UPDATE SKIP LOCKED"
+)
+
 
 class TextractQueue:
     """Textract Queue"""
 
+    # Class-level so every queue instance shares one in-flight Textract cap
+    # no matter how many workers drain concurrently.
+    semaphore = asyncio.Semaphore(16)
+
     def __init__(self):
-        self.queue = Queue()
-        self.textract_engine = TextractEngine()
+        self.textract_engine = get_textract_engine()
         self.db_session = DBSession()
 
     async def add_to_queue(self, image_uri: str, to_account_number: str):
         """Add the image URI to the queue.
 
+        Starts an async Textract job and records its JobId; the completion
+        webhook finishes the row when Textract reports back, so no worker
+        blocks on the analysis. The queue row is the queue: it survives a
+        restart, unlike the old in-process Queue.
+
         Parameters
         ----------
         - **image_uri**: (str) Image URI
         - **to_account_number**: (str) Account number
         """
+        response = self.textract_engine.start_analysis_job(image_uri)
         queue_item = ChequerTextractQueue(
-            image_uri=image_uri, to_account_number=to_account_number, status="PENDING"
+            image_uri=image_uri,
+            to_account_number=to_account_number,
+            status="IN_PROGRESS",
+            job_id=response["JobId"],
         )
         self.db_session.add_commit(queue_item)
-        self.queue.put(queue_item)
 
-    async def process_queue(self):
-        """Process the queue.
+    async def _analyze(self, image_uri: str):
+        """Run one Textract analysis under the concurrency cap.
+
+        Parameters
+        ----------
+        - **image_uri**: (str) Image URI to analyze
+
+        Returns
+        -------
+        - **Document**: Parsed Textract document
+        """
+        async with self.semaphore:
+            return await asyncio.to_thread(self.textract_engine.analyze_document, image_uri)
+
+    async def process_queue(self, batch_size: int = 32) -> int:
+        """Claim and process a batch of pending queue rows.
+
+        Rows are claimed with FOR UPDATE SKIP LOCKED and their Textract
+        calls run concurrently; the claim transaction commits once at the
+        end, releasing the row locks.
 
         Parameters
         ----------
-        - **db**: (DBSession) Database session
+        - **batch_size**: (int) Maximum rows to claim per call
+
+        Returns
+        -------
+        - **int**: Number of rows processed
         """
         db = self.db_session.db
-        queue_item = self.queue.get()
-        while queue_item is not None:
-            queue_item = self.queue.get()
-            document = self.textract_engine.analyze_document(queue_item.image_uri)
-            response_json = json.dumps(document.response)
-            db.add(
-                ChequerTextractQueue(
-                    image_uri=queue_item.image_uri,
-                    to_account_number=queue_item.to_account_number,
-                    status="COMPLETED",
-                    response=response_json,
+        rows = db.execute(_CLAIM_PENDING_STMT, {"batch_size": batch_size}).all()
+        if not rows:
+            db.rollback()
+            return 0
+
+        documents = await asyncio.gather(
+            *(self._analyze(row.image_uri) for row in rows), return_exceptions=True
+        )
+
+        # One IN query resolves every payer and payee row in the batch.
+        account_numbers = {row.to_account_number for row in rows}
+        account_numbers.update(
+            self.textract_engine.get_account_number(document)
+            for document in documents
+            if not isinstance(document, BaseException)
+        )
+        account_numbers.discard(None)
+        accounts = get_accounts_by_account_numbers(list(account_numbers), db)
+
+        for row, document in zip(rows, documents):
+            if isinstance(document, BaseException):
+                # One bad cheque should not poison the rest of the batch.
+                db.execute(
+                    text(
+                    "UPDATE chequer_textract_queue "
+                    "SET status = 'FAILED', updated_at = now() WHERE id = :id"
+                ),
+                    {"id": row.id},
                 )
-            )
-            db.commit()
+                continue
+            await self._finalize_row(db, row, document, accounts)
+        db.commit()
+        return len(rows)
+
+    async def _finalize_row(self, db, row, document, accounts=None):
+        """Run the post-Textract checks and record the outcome of one row.
 
-            payee_name = self.textract_engine.get_payee_name(document)
-            amount = self.textract_engine.get_amount(document)
-            date = self.textract_engine.get_date(document)
-            account_number = self.textract_engine.get_account_number(document)
-            ifs_code = self.textract_engine.get_ifs_code(document)
-            cheque_number = self.textract_engine.get_cheque_number(document)
+        Parameters
+        ----------
+        - **db**: (Session) Database session
+        - **row**: Queue row with id, image_uri and to_account_number
+        - **document**: (Document) Parsed Textract document
+        - **accounts**: (dict) Prefetched account_number -> Account mapping
+        """
+        # One pass over document.queries; get_date keeps its parsing logic.
+        fields = self.textract_engine.get_query_results(document)
+        payee_name = fields.get("payee_name")
+        amount = fields.get("amount")
+        date = self.textract_engine.get_date(document)
+        account_number = fields.get("account_number")
+        ifs_code = fields.get("ifs_code")
+        cheque_number = fields.get("cheque_number")
 
-            from_account = (
-                db.query(Account).filter(Account.account_number == account_number).first()
+        if accounts is None:
+            accounts = get_accounts_by_account_numbers(
+                [n for n in (account_number, row.to_account_number) if n is not None], db
             )
+        from_account = accounts.get(account_number)
+        to_account = accounts.get(row.to_account_number)
+        if from_account is None or to_account is None or to_account.name != payee_name:
+            db.execute(
+                text(
+                    "UPDATE chequer_textract_queue "
+                    "SET status = 'FAILED', updated_at = now() WHERE id = :id"
+                ),
+                {"id": row.id},
+            )
+            return
 
-            if from_account is None:
-                raise Exception("Account not found")
+        db.execute(
+            text(
+                "UPDATE chequer_textract_queue "
+                "SET status = 'COMPLETED', response = :response, updated_at = now() "
+                "WHERE id = :id"
+            ),
+            {"id": row.id, "response": json.dumps(document.response)},
+        )
+        await batch_writer.enqueue(
+            ChequeClearedRecord,
+            {
+                "payer_id": from_account.id,
+                "image_uri": row.image_uri,
+                "cheque_number": cheque_number,
+                "ocr_uri": "",
+                "to_account_number": row.to_account_number,
+                "payee_name": payee_name,
+                # Coerce the Textract strings before they reach the
+                # Float/DateTime columns; psycopg does not cast text.
+                "amount": self.textract_engine.parse_amount(amount),
+                "ifs_code": ifs_code,
+                "cheque_date": self.textract_engine.parse_cheque_date(date),
+                "status": "CLEARED",
+                "signature_similarity": 0.0,
+            },
+        )
 
-            to_account = (
-                db.query(Account)
-                .filter(Account.account_number == queue_item.to_account_number)
-                .first()
-            )
+    async def complete_job(self, job_id: str):
+        """Finish the queue row for a completed async Textract job.
 
-            if to_account is None:
-                raise Exception("Account not found")
-
-            if to_account.name is not payee_name:
-                raise Exception("Payee name does not match with the account name")
-
-            db.add(
-                ChequeClearedRecord(
-                    payer_id=from_account.id,
-                    image_url=queue_item.image_uri,
-                    cheque_number=cheque_number,
-                    ocr_url="",
-                    from_account_number=account_number,
-                    to_account_number=queue_item.to_account_number,
-                    amount=amount,
-                    ifs_code=ifs_code,
-                    cheque_date=date,
-                )
-            )
-            db.commit()
-            self.queue.task_done()
+        SNS delivers at least once, so a redelivered notification must be
+        a no-op; only rows still IN_PROGRESS are finalized.
+
+        Parameters
+        ----------
+        - **job_id**: (str) JobId reported by the completion notification
+        """
+        db = self.db_session.db
+        row = (
+            db.query(ChequerTextractQueue).filter(ChequerTextractQueue.job_id == job_id).first()
+        )
+        if row is None or row.status != "IN_PROGRESS":
+            return
+        document = await asyncio.to_thread(self.textract_engine.get_analysis_result, job_id)
+        await self._finalize_row(db, row, document)
+        db.commit()
+
+    def fail_job(self, job_id: str):
+        """Mark the queue row of a failed async Textract job.
+
+        Parameters
+        ----------
+        - **job_id**: (str) JobId reported by the failure notification
+        """
+        db = self.db_session.db
+        db.execute(
+            text(
+                "UPDATE chequer_textract_queue "
+                "SET status = 'FAILED', updated_at = now() "
+                "WHERE job_id = :job_id AND status = 'IN_PROGRESS'"
+            ),
+            {"job_id": job_id},
+        )
+        db.commit()
 
     def get_queue(self):
-        """Get the queue."""
-        return list(self.queue.queue)
+        """Get the pending queue items."""
+        db = self.db_session.db
+        return db.query(ChequerTextractQueue).filter(ChequerTextractQueue.status == "PENDING").all()
 
     def get_queue_item(self, queue_id: int):
         """Get the queue item by queue ID.
@@ -113,17 +233,52 @@ class TextractQueue:
         return queue_item
 
 
+@lru_cache(maxsize=1)
+def get_textract_queue() -> TextractQueue:
+    """Get the process-wide TextractQueue instance.
+
+    Returns
+    -------
+    - **TextractQueue**: Shared queue instance
+    """
+    return TextractQueue()
+
+
 class TextractQueueManager:
     """Background service runner for managing Textract queue."""
 
-    def __init__(self, textract_queue: Optional[TextractQueue] = None):
+    def __init__(self, textract_queue: Optional[TextractQueue] = None, max_workers: int = 4):
         self.textract_queue = textract_queue if textract_queue is not None else TextractQueue()
+        self.max_workers = max_workers
 
-    async def process_queue_forever(self):
-        """Continuously process the queue."""
+    async def _drain_forever(self, textract_queue: TextractQueue):
+        """Claim and process batches until cancelled.
+
+        Parameters
+        ----------
+        - **textract_queue**: (TextractQueue) Queue with its own DB session
+        """
         while True:
-            await self.textract_queue.process_queue()
-            await asyncio.sleep(1)  # Adjust sleep time as needed
+            processed = await textract_queue.process_queue()
+            if processed == 0:
+                await asyncio.sleep(0.5)
+
+    async def process_queue_forever(self):
+        """Continuously process the queue with max_workers concurrent drains.
+
+        Each worker gets its own TextractQueue (and so its own session);
+        SKIP LOCKED keeps their claimed batches disjoint, and the shared
+        class-level semaphore still caps total Textract concurrency.
+        """
+        # The finalizers enqueue cleared records through the batch writer;
+        # start its consumer here so the standalone queue runner (which has
+        # no FastAPI lifespan) does not enqueue into a queue nobody drains.
+        # start() is a no-op when the lifespan already ran it.
+        batch_writer.start()
+        async with asyncio.TaskGroup() as task_group:
+            task_group.create_task(self._drain_forever(self.textract_queue))
+            for _ in range(self.max_workers - 1):
+                task_group.create_task(self._drain_forever(TextractQueue()))
 
     async def add_to_queue_async(self, image_uri: str, to_account_number: str):
         """Add an item to the queue asynchronously.
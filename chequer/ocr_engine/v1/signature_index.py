@@ -0,0 +1,104 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from chequer.accounts.models import Account
+from chequer.utils.db_utils import DBSession
+
+
+class SignatureIndex:
+    """In-memory nearest-neighbour index over stored signature embeddings.
+
+    Embeddings are L2-normalized once at load time, so a top-k search is a
+    single inner-product matmul against the stacked matrix. Brute force is
+    ample at current account counts; the interface leaves room to swap in an
+    ANN backend (FAISS IVF/PQ) if the table ever grows past that.
+    """
+
+    def __init__(self):
+        self._account_ids = np.empty(0, dtype=np.int64)
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+
+    def load(self, db=None):
+        """Build the index from the embeddings stored on accounts.
+
+        Parameters
+        ----------
+        - **db**: (Session) Database session
+        """
+        if db is None:
+            db = DBSession().db
+        rows = db.execute(
+            select(Account.id, Account.signature_embedding).where(
+                Account.signature_embedding.is_not(None)
+            )
+        ).all()
+        ids = []
+        vectors = []
+        for account_id, packed in rows:
+            vector = np.frombuffer(packed, np.float16).astype(np.float32)
+            norm = np.linalg.norm(vector)
+            if norm:
+                vector = vector / norm
+            ids.append(account_id)
+            vectors.append(vector)
+        if not ids:
+            self._account_ids = np.empty(0, dtype=np.int64)
+            self._matrix = np.empty((0, 0), dtype=np.float32)
+            return
+        self._account_ids = np.asarray(ids, dtype=np.int64)
+        self._matrix = np.stack(vectors)
+
+    def add(self, account_id: int, embedding: np.ndarray):
+        """Add one embedding to the index without a full reload.
+
+        Parameters
+        ----------
+        - **account_id**: (int) Account the signature belongs to
+        - **embedding**: (np.ndarray) Signature embedding
+        """
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        if self._matrix.size == 0:
+            self._account_ids = np.asarray([account_id], dtype=np.int64)
+            self._matrix = vector[None, :]
+            return
+        self._account_ids = np.append(self._account_ids, account_id)
+        self._matrix = np.vstack([self._matrix, vector])
+
+    def search(self, embedding: np.ndarray, k: int = 5) -> List[Tuple[int, float]]:
+        """Find the stored signatures most similar to the given embedding.
+
+        Parameters
+        ----------
+        - **embedding**: (np.ndarray) Query signature embedding
+        - **k**: (int) Number of matches to return
+
+        Returns
+        -------
+        - **List[Tuple[int, float]]**: (account_id, similarity) pairs, best first
+        """
+        if self._matrix.size == 0:
+            return []
+        query = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        scores = self._matrix @ query
+        top = np.argsort(scores)[::-1][:k]
+        return [(int(self._account_ids[i]), float(scores[i])) for i in top]
+
+
+@lru_cache(maxsize=1)
+def get_signature_index() -> SignatureIndex:
+    """Get the process-wide SignatureIndex instance.
+
+    Returns
+    -------
+    - **SignatureIndex**: Shared index instance
+    """
+    return SignatureIndex()
@@ -1,8 +1,3 @@
-import queue
 from chequer.ocr_engine.v1.queue import TextractQueueManager
-import asyncio
-import queue
-from chequer.ocr_engine.v1.queue import TextractQueueManager
-import asyncio
 
 queue_manager = TextractQueueManager()
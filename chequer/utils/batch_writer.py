@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import insert
+
+from chequer.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """Buffer log-style inserts and flush them as one multi-row INSERT.
+
+    Rows are queued from request handlers and drained by a single consumer
+    task, so a burst of events costs one commit instead of one commit per
+    event. Only rows whose generated columns are never read back should go
+    through here; inserts that need RETURNING stay on the direct path.
+
+    Attributes
+    ----------
+    - **max_batch_size**: (int) Maximum rows per flush
+    - **flush_interval**: (float) Seconds to wait for more rows before flushing
+    """
+
+    def __init__(self, max_batch_size: int = 200, flush_interval: float = 0.05):
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def enqueue(self, model, values: dict):
+        """Queue a row for insertion.
+
+        Parameters
+        ----------
+        - **model**: (Base) Mapped model class to insert into
+        - **values**: (dict) Column values for the row
+        """
+        await self.queue.put((model, values))
+
+    def start(self):
+        """Start the consumer task. Call once at application startup."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._consume_forever())
+
+    async def stop(self):
+        """Stop the consumer task, flushing anything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        pending = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        if pending:
+            await asyncio.to_thread(self._flush, pending)
+
+    async def _consume_forever(self):
+        while True:
+            batch = await self._drain()
+            if not batch:
+                continue
+            try:
+                await asyncio.to_thread(self._flush, batch)
+            except Exception:
+                # A failed flush must not kill the consumer; the batch is
+                # lost, but later batches keep draining.
+                logger.exception("Batch flush failed; dropped %d rows", len(batch))
+
+    async def _drain(self):
+        batch = [await self.queue.get()]
+        deadline = asyncio.get_event_loop().time() + self.flush_interval
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - asyncio.get_event_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _flush(self, batch):
+        grouped = {}
+        for model, values in batch:
+            grouped.setdefault(model, []).append(values)
+        db = SessionLocal()
+        try:
+            for model, rows in grouped.items():
+                db.execute(insert(model), rows)
+            db.commit()
+        finally:
+            db.close()
+
+
+batch_writer = BatchWriter()
@@ -3,7 +3,11 @@ from chequer.database import SessionLocal
 
 def get_db():
     """
-    Get database session
+    Get database session scoped to the request.
+
+    The session acts as the transaction boundary: work left pending when
+    the handler returns is committed in one round-trip, and any exception
+    rolls the whole request back.
 
     Returns
     -------
@@ -12,6 +16,10 @@ def get_db():
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
@@ -26,7 +34,6 @@ class DBSession:
     def add_commit(self, item):
         self.db.add(item)
         self.db.commit()
-        self.db.refresh(item)
 
     def update_commit(self, item):
         item_class = item.__class__
@@ -36,7 +43,6 @@ class DBSession:
         for key, value in item.dict().items():
             setattr(_item, key, value)
         self.db.commit()
-        self.db.refresh(_item)
 
     def commit(self):
         self.db.commit()
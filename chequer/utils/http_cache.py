@@ -0,0 +1,36 @@
+import hashlib
+
+from fastapi import Request
+
+
+def make_etag(*parts) -> str:
+    """Build an entity tag from the given parts.
+
+    BLAKE2 is used over SHA-256 because it is cheaper per byte and the tag
+    only needs to be a stable fingerprint, not cryptographically binding.
+
+    Parameters
+    ----------
+    - **parts**: Values that uniquely describe the current response state
+
+    Returns
+    -------
+    - **str**: Hex entity tag
+    """
+    raw = ":".join(str(part) for part in parts).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def is_etag_match(request: Request, etag: str) -> bool:
+    """Check whether the client already holds the current response.
+
+    Parameters
+    ----------
+    - **request**: (Request) Incoming request
+    - **etag**: (str) Entity tag of the current response state
+
+    Returns
+    -------
+    - **bool**: True if If-None-Match matches the tag
+    """
+    return request.headers.get("if-none-match") == etag
@@ -1,9 +1,13 @@
-from distutils.command import check
 import os
 from enum import Enum
+from functools import lru_cache
+from io import BytesIO
 from typing import IO, Union
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from cachetools import TTLCache
+from botocore.exceptions import ClientError
 
 from chequer.utils.s3_utils.exceptions import FileDoesNotExistError
 
@@ -22,6 +26,40 @@ class StoreTypes(Enum):
     SIGNATURES = "signatures"
 
 
+# Shared transfer settings: multipart over 8 MB with parallel part uploads.
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+
+@lru_cache(maxsize=1)
+def _shared_s3_client():
+    """Get the process-wide S3 client.
+
+    Session construction does credential discovery and service-model
+    loading; one client (thread-safe in boto3) serves every store.
+
+    Returns
+    -------
+    - **boto3.client**: Shared S3 client
+    """
+    return boto3.Session().client("s3")
+
+
+@lru_cache(maxsize=1)
+def _store_bucket_name() -> str:
+    """Get the configured Chequer store bucket name.
+
+    Returns
+    -------
+    - **str**: Bucket name from S3_CHEQUER_STORE
+    """
+    return os.environ["S3_CHEQUER_STORE"]
+
+
 def check_file_exists(method):
     """Decorator to check if the file exists in the S3 bucket.
 
@@ -50,12 +88,28 @@ class ChequerStore:
     - **bucket_name**: (str) S3 bucket name
     """
 
+    # Presigned URLs are minted with ExpiresIn=120; reusing one for up to
+    # 100 s skips the SigV4 HMAC chain and the existence HEAD on hot files.
+    _url_cache: TTLCache = TTLCache(maxsize=4096, ttl=100)
+
     def __init__(self, store_type: StoreTypes):
-        _session = boto3.Session()
-        self.s3 = _session.client("s3")
-        self.bucket_name = os.environ["S3_CHEQUER_STORE"]
+        self.s3 = _shared_s3_client()
+        self.bucket_name = _store_bucket_name()
         self.store_name = store_type.value
 
+    def get_file_uri(self, file_name: str) -> str:
+        """Get the S3 URI a file will have in this store.
+
+        Parameters
+        ----------
+        - **file_name**: (str) Name of the file
+
+        Returns
+        -------
+        - **str**: S3 URI of the file
+        """
+        return f"s3://{self.bucket_name}/{self.store_name}/{file_name}"
+
     def get_storage_path_from_uri(self, file_uri: str):
         """Get the storage path from the S3 URI.
 
@@ -67,7 +121,7 @@ class ChequerStore:
         -------
         - **str**: Storage path of the file
         """
-        return file_uri.split("s3://")[1]
+        return file_uri.removeprefix("s3://")
 
     def list_files(self):
         """List all the files in the S3 bucket.
@@ -91,11 +145,54 @@ class ChequerStore:
         -------
         - **str**: S3 URI of the uploaded file
         """
-        if self.file_exists(file_name):
-            raise FileExistsError
         if isinstance(file, str):
             file = file.encode("utf-8")
-        self.s3.put_object(Bucket=self.bucket_name, Key=f"{self.store_name}/{file_name}", Body=file)
+        if not isinstance(file, bytes):
+            file = file.read()
+        if len(file) >= _TRANSFER_CONFIG.multipart_threshold:
+            # Large bodies go through the parallel multipart path; the
+            # transfer manager cannot do a conditional put, so the check
+            # stays client-side here.
+            if self.file_exists(file_name):
+                raise FileExistsError
+            self.s3.upload_fileobj(
+                BytesIO(file),
+                self.bucket_name,
+                f"{self.store_name}/{file_name}",
+                Config=_TRANSFER_CONFIG,
+            )
+            return f"s3://{self.bucket_name}/{self.store_name}/{file_name}"
+        # The pinned botocore (1.34.x) predates conditional writes, so the
+        # existence check stays client-side until the pin moves past 1.35.
+        if self.file_exists(file_name):
+            raise FileExistsError
+        self.s3.put_object(
+            Bucket=self.bucket_name,
+            Key=f"{self.store_name}/{file_name}",
+            Body=file,
+        )
+        return f"s3://{self.bucket_name}/{self.store_name}/{file_name}"
+
+    def upload_fileobj(self, fileobj: IO, file_name: str) -> str:
+        """Upload a file-like object to the S3 bucket without reading it into memory.
+
+        Parameters
+        ----------
+        - **fileobj**: (IO) File-like object opened in binary mode
+        - **file_name**: (str) Name of the file
+
+        Returns
+        -------
+        - **str**: S3 URI of the uploaded file
+        """
+        if self.file_exists(file_name):
+            raise FileExistsError
+        self.s3.upload_fileobj(
+            fileobj,
+            self.bucket_name,
+            f"{self.store_name}/{file_name}",
+            Config=_TRANSFER_CONFIG,
+        )
         return f"s3://{self.bucket_name}/{self.store_name}/{file_name}"
 
     def download_file(self, file_name: str, file_path: str):
@@ -108,7 +205,12 @@ class ChequerStore:
         """
         if not self.file_exists(file_name):
             raise FileDoesNotExistError(file_name, self.store_name)
-        self.s3.download_file(self.bucket_name, f"{self.store_name}/{file_name}", file_path)
+        self.s3.download_file(
+            self.bucket_name,
+            f"{self.store_name}/{file_name}",
+            file_path,
+            Config=_TRANSFER_CONFIG,
+        )
 
     def get_file(self, file_name: str):
         """Get a file from the S3 bucket.
@@ -148,13 +250,19 @@ class ChequerStore:
         -------
         - **str**: URL of the file
         """
+        cache_key = (self.store_name, file_name)
+        url = self._url_cache.get(cache_key)
+        if url is not None:
+            return url
         if not self.file_exists(file_name):
             raise FileDoesNotExistError(file_name, self.store_name)
-        return self.s3.generate_presigned_url(
+        url = self.s3.generate_presigned_url(
             "get_object",
             Params={"Bucket": self.bucket_name, "Key": f"{self.store_name}/{file_name}"},
             ExpiresIn=120,
         )
+        self._url_cache[cache_key] = url
+        return url
 
     def get_file_from_uri(self, file_uri: str):
         """Get the file object from the S3 URI.
@@ -167,7 +275,9 @@ class ChequerStore:
         -------
         - **bytes**: File content
         """
-        bucket_name, key = file_uri.split("s3://")[1].split("/")
+        # partition keeps everything after the first "/" as the key, so
+        # nested keys like "cheques/abc/def.png" parse correctly.
+        bucket_name, _, key = file_uri.removeprefix("s3://").partition("/")
         response = self.s3.get_object(Bucket=bucket_name, Key=key)
         return response["Body"].read()
 
@@ -182,8 +292,12 @@ class ChequerStore:
         -------
         - **bool**: True if the file exists, False otherwise
         """
-        print(f"{self.store_name}/{file_name}")
-        response = self.s3.list_objects_v2(
-            Bucket=self.bucket_name, Prefix=f"{self.store_name}/{file_name}", MaxKeys=1
-        )
-        return "Contents" in response
+        try:
+            # HEAD is a single keyed request with a higher rate limit than
+            # the prefix listing it replaces.
+            self.s3.head_object(Bucket=self.bucket_name, Key=f"{self.store_name}/{file_name}")
+        except ClientError as error:
+            if error.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return False
+            raise
+        return True
@@ -1,15 +1,40 @@
-from fastapi import Depends, FastAPI, HTTPException, status
+import asyncio
+import os
+import re
+import urllib.parse
+import urllib.request
+from contextlib import asynccontextmanager
+
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
 
 from chequer.auth.router import router as auth_router
 from chequer.accounts.router import router as accounts_router
 from chequer.ocr_engine.router import router as ocr_engine_router
+from chequer.ocr_engine.v1.analyse import get_signature_similarity_engine
+from chequer.ocr_engine.v1.queue import get_textract_queue
+from chequer.ocr_engine.v1.signature_index import get_signature_index
+from chequer.utils.batch_writer import batch_writer
 from chequer.utils.db_utils import get_db
 from chequer.database import sync_engine, Base
 
 Base.metadata.create_all(bind=sync_engine)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load and warm the signature model before serving traffic."""
+    # Engine construction warms the model with a throwaway inference.
+    await asyncio.to_thread(get_signature_similarity_engine)
+    await asyncio.to_thread(get_signature_index().load)
+    batch_writer.start()
+    yield
+    await batch_writer.stop()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 app.include_router(auth_router)
 app.include_router(accounts_router)
@@ -28,6 +53,56 @@ async def root():
     return {"message": "Chequer API", "version": "0.1.0"}
 
 
+@app.post("/textract/callback", status_code=status.HTTP_200_OK)
+async def textract_callback(request: Request):
+    """
+    Completion webhook for async Textract jobs (SNS over HTTPS).
+
+    Parameters
+    ----------
+    - **request**: (Request) SNS notification wrapping the Textract message
+
+    Returns
+    -------
+    - **JSONResponse**: Acknowledgement
+    """
+    payload = orjson.loads(await request.body())
+
+    # Only accept messages from the configured Textract topic; anything
+    # else could drive complete_job with an attacker-chosen JobId. The ARN
+    # is the only thing tying the body to Textract, so fail closed when no
+    # topic is configured rather than trusting every caller.
+    expected_topic = os.getenv("TEXTRACT_SNS_TOPIC_ARN")
+    if expected_topic is None or payload.get("TopicArn") != expected_topic:
+        raise HTTPException(status_code=403, detail="Unknown topic")
+
+    if payload.get("Type") == "SubscriptionConfirmation":
+        # SNS will not deliver notifications until the SubscribeURL is
+        # visited; answer the handshake instead of 400ing it. Only SNS's
+        # own HTTPS endpoint is ever fetched — following an arbitrary
+        # body-supplied URL would let callers proxy GETs through us.
+        subscribe_url = payload.get("SubscribeURL", "")
+        parsed = urllib.parse.urlsplit(subscribe_url)
+        if parsed.scheme != "https" or not re.fullmatch(
+            r"sns\.[a-z0-9-]+\.amazonaws\.com", parsed.hostname or ""
+        ):
+            raise HTTPException(status_code=400, detail="Invalid SubscribeURL")
+        await asyncio.to_thread(urllib.request.urlopen, subscribe_url)
+        return {"status": "ok"}
+
+    # SNS wraps the Textract message in a JSON-encoded "Message" field.
+    message = payload.get("Message")
+    message = orjson.loads(message) if isinstance(message, str) else payload
+    job_id = message.get("JobId")
+    if job_id is None:
+        raise HTTPException(status_code=400, detail="Missing JobId")
+    if message.get("Status") == "SUCCEEDED":
+        await get_textract_queue().complete_job(job_id)
+    else:
+        get_textract_queue().fail_job(job_id)
+    return {"status": "ok"}
+
+
 @app.get("/healthcheck", status_code=status.HTTP_200_OK)
 async def perform_healthcheck(db=Depends(get_db)):
     """
@@ -0,0 +1,45 @@
+"""Convert the VGG16 signature model to float16 weights.
+
+Rebuilds the SavedModel in chequer/models/VGG16 with a float16 dtype policy
+and copies the trained weights across, halving the bytes each Uvicorn worker
+keeps resident for the model. The output directory is picked up
+automatically by SignatureSimilarityEngine when present.
+
+Use either this or the INT8 TFLite file from
+scripts/quantize_signature_model.py, not both; the engine prefers the TFLite
+file when both exist.
+
+Usage
+-----
+python scripts/convert_signature_model_fp16.py
+"""
+
+import os
+
+import tensorflow as tf
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+MODEL_PATH = os.path.join(REPO_ROOT, "chequer", "models", "VGG16")
+OUTPUT_PATH = os.path.join(REPO_ROOT, "chequer", "models", "VGG16-fp16")
+
+
+def main():
+    model = tf.keras.models.load_model(MODEL_PATH)
+
+    # Cloning under a float16 policy rebuilds every layer with float16
+    # variables; the input layer still accepts float32 and casts once.
+    tf.keras.mixed_precision.set_global_policy("float16")
+    model_fp16 = tf.keras.models.clone_model(model)
+    model_fp16.set_weights(model.get_weights())
+
+    model_fp16.save(OUTPUT_PATH, save_format="tf")
+    size = sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(OUTPUT_PATH)
+        for name in names
+    )
+    print(f"Wrote {OUTPUT_PATH} ({size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
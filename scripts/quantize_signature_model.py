@@ -0,0 +1,79 @@
+"""Quantize the VGG16 signature model to TFLite.
+
+INT8 mode runs post-training quantization over the SavedModel in
+chequer/models/VGG16 using a directory of real signature crops as the
+calibration set; float16 mode needs no calibration data and halves the
+weight bytes while keeping float kernels. Either output file is picked up
+automatically by SignatureSimilarityEngine when present (INT8 wins when
+both exist).
+
+Usage
+-----
+python scripts/quantize_signature_model.py --calibration-dir <dir-of-signature-images>
+python scripts/quantize_signature_model.py --float16
+"""
+
+import argparse
+import os
+
+import numpy as np
+import tensorflow as tf
+from PIL import Image
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+MODEL_PATH = os.path.join(REPO_ROOT, "chequer", "models", "VGG16")
+OUTPUT_PATH = os.path.join(REPO_ROOT, "chequer", "models", "VGG16-int8.tflite")
+OUTPUT_PATH_FP16 = os.path.join(REPO_ROOT, "chequer", "models", "VGG16-fp16.tflite")
+
+
+def load_calibration_images(calibration_dir: str, limit: int):
+    """Yield preprocessed calibration batches for the converter.
+
+    Parameters
+    ----------
+    - **calibration_dir**: (str) Directory of signature images
+    - **limit**: (int) Maximum number of images to use
+    """
+    file_names = sorted(os.listdir(calibration_dir))[:limit]
+    for file_name in file_names:
+        image = Image.open(os.path.join(calibration_dir, file_name))
+        image = image.convert("RGB").resize((224, 224))
+        array = np.asarray(image, dtype=np.float32)[None, ...]
+        yield [array]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calibration-dir", help="Directory of signature images (INT8 mode)")
+    parser.add_argument("--limit", type=int, default=100, help="Calibration images to use")
+    parser.add_argument(
+        "--float16", action="store_true", help="Quantize weights to float16 (no calibration)"
+    )
+    args = parser.parse_args()
+    if not args.float16 and args.calibration_dir is None:
+        parser.error("--calibration-dir is required unless --float16 is given")
+
+    converter = tf.lite.TFLiteConverter.from_saved_model(MODEL_PATH)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if args.float16:
+        converter.target_spec.supported_types = [tf.float16]
+        output_path = OUTPUT_PATH_FP16
+    else:
+        converter.representative_dataset = lambda: load_calibration_images(
+            args.calibration_dir, args.limit
+        )
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        output_path = OUTPUT_PATH
+    # Keep float I/O so the engine feeds float32 batches and reads float32
+    # embeddings; only the internal kernels change precision.
+    converter.inference_input_type = tf.float32
+    converter.inference_output_type = tf.float32
+
+    tflite_model = converter.convert()
+    with open(output_path, "wb") as output_file:
+        output_file.write(tflite_model)
+    print(f"Wrote {output_path} ({len(tflite_model) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()